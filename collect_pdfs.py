@@ -22,7 +22,9 @@ def collect_pdfs():
     
     logger.info(f"Found {len(pdf_files)} PDF files")
     
-    # Copy each PDF with a standardized name
+    # Copy each PDF with a standardized name, tallying size as we go
+    copied = 0
+    total_size = 0
     for pdf_path in sorted(pdf_files):
         # Extract quarter and year from path
         parent_dir = os.path.basename(os.path.dirname(pdf_path))
@@ -35,13 +37,19 @@ def collect_pdfs():
             target_path = os.path.join(target_dir, new_name)
             
             logger.info(f"Copying {os.path.basename(pdf_path)} → {new_name}")
-            shutil.copy2(pdf_path, target_path)
-    
-    # Check final size
-    total_size = sum(os.path.getsize(os.path.join(target_dir, f)) 
-                    for f in os.listdir(target_dir) if f.endswith('.pdf'))
+            if os.path.exists(target_path):
+                os.remove(target_path)
+            try:
+                # Hard link when source and target share a filesystem (no data copied)
+                os.link(pdf_path, target_path)
+            except OSError:
+                # copyfile uses the kernel's sendfile/copy_file_range fast path
+                shutil.copyfile(pdf_path, target_path)
+            
+            copied += 1
+            total_size += os.stat(pdf_path).st_size
     
-    logger.info(f"\n✅ Copied {len(pdf_files)} PDF files")
+    logger.info(f"\n✅ Copied {copied} PDF files")
     logger.info(f"Total size: {total_size / (1024*1024):.1f} MB")
     logger.info(f"PDFs saved to: {target_dir}/")
 
@@ -22,24 +22,126 @@ If you run this, it will ask you if you want to delete the files this downloads.
 
 import pandas as pd
 import os
+import sys
 import shutil
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from contextlib import redirect_stdout
 from io import StringIO
 
+# Low-cardinality text columns used as grouping keys in analyze_data
+CATEGORY_COLUMNS = ['agysubt', 'edlvlt', 'loct', 'patcot', 'agelvlt', 'supervist', 'wrkscht', 'year', 'quarter']
+
+# Every column analyze_data reads; the example loads project to these
+ANALYSIS_COLUMNS = CATEGORY_COLUMNS + ['employment', 'salary']
+
+LOCAL_SEPT_FILE = 'fedscope_data/parquet/fedscope_employment_September_2024.parquet'
+LOCAL_MARCH_FILE = 'fedscope_data/parquet/fedscope_employment_March_2025.parquet'
+
 def ensure_directory_exists(path):
     """Create directory if it doesn't exist"""
     if not os.path.exists(path):
         os.makedirs(path)
         print(f"Created directory: {path}")
 
-def safe_int_conversion(value):
-    """Safely convert a value to integer, handling various edge cases"""
-    if pd.isna(value) or value == 'nan' or value == '*****' or value == '':
-        return None
+def download_file(url, local_path):
+    """
+    Download url to local_path through a temporary .part file, so an interrupted or
+    failed download never leaves a truncated file that later runs take as cached.
+    """
+    partial_path = local_path + '.part'
     try:
-        return int(float(value))  # float() first handles cases like '123.0'
-    except (ValueError, TypeError):
-        return None
+        urllib.request.urlretrieve(url, partial_path)
+        os.replace(partial_path, local_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+def convert_to_categories(df):
+    """Convert the grouping columns to category dtype so groupby/value_counts hash int codes"""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+def count_file_columns(path):
+    """Number of data columns in a parquet file, from its footer schema (no row data read)"""
+    return len([name for name in pq.read_schema(path).names if not name.startswith('__index_level_')])
+
+def load_parquet(path, columns=None):
+    """
+    Load a parquet file for the examples.
+    
+    Pass columns to read only those column chunks (None reads every column).
+    Returns (DataFrame, size in MB). The size is summed from the Arrow buffers,
+    which is O(columns) instead of the per-string walk of memory_usage(deep=True).
+    """
+    table = pq.read_table(path, columns=columns, pre_buffer=True, use_threads=True)
+    size_mb = table.nbytes / 1024**2
+    df = table.to_pandas()
+    
+    # Employment is stored as string '1' for each record; parse it once here so
+    # every aggregation can use native integer sums (sentinels count as 0)
+    df['employment'] = pd.to_numeric(df['employment'], errors='coerce').fillna(0).astype('int32')
+    return convert_to_categories(df), size_mb
+
+def count_values_single_pass(df, columns):
+    """
+    Count the values of several columns with one DuckDB GROUPING SETS scan.
+    
+    Returns a dict of column -> Series of counts (descending), like value_counts().
+    """
+    con = duckdb.connect()
+    con.register('counts_source', df[columns])
+    
+    select_cols = ", ".join(f"{col}, GROUPING({col}) AS grouping_{col}" for col in columns)
+    grouping_sets = ", ".join(f"({col})" for col in columns)
+    rows = con.execute(f"""
+        SELECT {select_cols}, COUNT(*) AS n
+        FROM counts_source
+        GROUP BY GROUPING SETS ({grouping_sets})
+    """).fetchdf()
+    con.close()
+    
+    # GROUPING(col) is 0 on the rows that were grouped by col
+    counts = {}
+    for col in columns:
+        col_rows = rows[(rows[f'grouping_{col}'] == 0) & rows[col].notna()]
+        counts[col] = pd.Series(col_rows['n'].to_numpy(), index=col_rows[col].to_numpy(), name='count').sort_values(ascending=False)
+    return counts
+
+def count_redacted_in_parquet(path):
+    """
+    Count REDACTED cells per column straight from a parquet file.
+    
+    Returns (Series of counts, row count). Only the string columns are read, as
+    dictionaries: 'REDACTED' is matched once against each chunk's dictionary and
+    the integer indices are gathered, so no pandas strings are materialized.
+    """
+    parquet_file = pq.ParquetFile(path)
+    string_cols = [field.name for field in parquet_file.schema_arrow
+                   if pa.types.is_string(field.type) or pa.types.is_large_string(field.type)]
+    table = pq.read_table(path, columns=string_cols, read_dictionary=string_cols,
+                          pre_buffer=True, use_threads=True)
+    
+    counts = {}
+    for col in string_cols:
+        count = 0
+        for chunk in table[col].chunks:
+            is_redacted = pc.equal(chunk.dictionary, 'REDACTED')
+            count += pc.sum(pc.take(is_redacted, chunk.indices)).as_py() or 0
+        counts[col] = count
+    return pd.Series(counts, dtype='int64'), parquet_file.metadata.num_rows
+
+def format_distribution(counts, total):
+    """Format value counts as one block of '   label: N employees (P%)' lines"""
+    return "\n".join(f"   {label}: {count:,} employees ({count/total*100:.1f}%)"
+                     for label, count in counts.items())
 
 def run_local_examples():
     """Run examples using local parquet files"""
@@ -48,8 +150,8 @@ def run_local_examples():
     print("="*80 + "\n")
     
     # Check if local files exist
-    local_file = 'fedscope_data/parquet/fedscope_employment_September_2024.parquet'
-    march_file = 'fedscope_data/parquet/fedscope_employment_March_2025.parquet'
+    local_file = LOCAL_SEPT_FILE
+    march_file = LOCAL_MARCH_FILE
     
     if not os.path.exists(local_file):
         print(f"ERROR: Local file not found: {local_file}")
@@ -60,20 +162,22 @@ def run_local_examples():
         print("2. Run this script from the repository root directory")
         return None, None
     
+    # Only analyze_data uses the DataFrames (redaction counts are read from the
+    # files directly), so skip the columns it never reads
     print(f"Loading local file: {local_file}")
-    df = pd.read_parquet(local_file)
+    df, size_mb = load_parquet(local_file, columns=ANALYSIS_COLUMNS)
     print(f"✓ Successfully loaded {len(df):,} records from September 2024")
-    print(f"  Columns: {df.shape[1]}")
-    print(f"  Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
+    print(f"  Columns: {count_file_columns(local_file)} ({df.shape[1]} loaded)")
+    print(f"  Data size: {size_mb:.1f} MB")
     
     # Load March 2025 if available
     df_march = None
     if os.path.exists(march_file):
         print(f"\nLoading March 2025 file: {march_file}")
-        df_march = pd.read_parquet(march_file)
+        df_march, march_size_mb = load_parquet(march_file, columns=ANALYSIS_COLUMNS)
         print(f"✓ Successfully loaded {len(df_march):,} records from March 2025")
-        print(f"  Columns: {df_march.shape[1]}")
-        print(f"  Memory usage: {df_march.memory_usage(deep=True).sum() / 1024**2:.1f} MB")
+        print(f"  Columns: {count_file_columns(march_file)} ({df_march.shape[1]} loaded)")
+        print(f"  Data size: {march_size_mb:.1f} MB")
     else:
         print(f"\nNote: March 2025 file not found: {march_file}")
     
@@ -98,9 +202,10 @@ def run_download_examples():
     print("This may take a moment (file is ~30-40 MB)...")
     
     try:
-        df = pd.read_parquet(url)
-        # Save locally for faster subsequent access in this session
-        df.to_parquet(local_download_path)
+        # Stream the file straight to disk, then read it once (no decode/re-encode round trip)
+        download_file(url, local_download_path)
+        # The downloaded data only feeds analyze_data, so skip the columns it never reads
+        df, _ = load_parquet(local_download_path, columns=ANALYSIS_COLUMNS)
         print(f"✓ Successfully downloaded and loaded {len(df):,} records")
         print(f"  Also saved locally to: {local_download_path}")
         
@@ -121,90 +226,94 @@ def analyze_data(df, source_type):
     print(f"ANALYSIS EXAMPLES ({source_type})")
     print(f"{'='*80}\n")
     
+    def salary_by_education():
+        # Convert salary to numeric; '*****' redactions, 'nan' and blanks coerce to NaN
+        salary_numeric = pd.to_numeric(df['salary'], errors='coerce')
+        valid = salary_numeric.notna()
+        salary_by_edu = salary_numeric[valid].groupby(df.loc[valid, 'edlvlt'], observed=True).mean()
+        return salary_numeric, salary_by_edu.sort_values(ascending=False)
+    
+    # The aggregations are independent read-only reductions, and pandas' groupby
+    # kernels and DuckDB release the GIL, so run them concurrently and print in order
+    tasks = {
+        'agencies': lambda: df['employment'].groupby(df['agysubt'], observed=True, sort=False).sum().nlargest(10),
+        'salary': salary_by_education,
+        'quarterly': lambda: df['employment'].groupby([df['year'], df['quarter']], observed=True).sum(),
+        # Examples 4-8 are plain value counts; compute them all in one scan
+        'distributions': lambda: count_values_single_pass(df, ['loct', 'patcot', 'agelvlt', 'supervist', 'wrkscht']),
+    }
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        results = {name: executor.submit(task) for name, task in tasks.items()}
+    
     # Example 1: Count employees by agency
     print("1. TOP 10 AGENCIES BY EMPLOYEE COUNT")
     print("-" * 40)
     try:
-        # Employment is stored as string '1' for each record
-        agency_counts = df.groupby('agysubt')['employment'].apply(
-            lambda x: sum(int(i) for i in x if i not in ['nan', '*****', ''])
-        ).sort_values(ascending=False).head(10)
-        for i, (agency, count) in enumerate(agency_counts.items(), 1):
-            print(f"{i:2d}. {agency}: {count:,} employees")
+        agency_counts = results['agencies'].result()
+        print("\n".join(f"{i:2d}. {agency}: {count:,} employees"
+                        for i, (agency, count) in enumerate(agency_counts.items(), 1)))
     except Exception as e:
         print(f"Error: {e}")
     
     print("\n2. AVERAGE SALARY BY EDUCATION LEVEL (TOP 5)")
     print("-" * 40)
     try:
-        # Convert salary to numeric, handling all edge cases
-        df['salary_numeric'] = df['salary'].apply(safe_int_conversion)
-        
-        # Filter to records with valid salary data
-        df_with_salary = df[df['salary_numeric'].notna()]
-        print(f"   Records with valid salary data: {len(df_with_salary):,} ({len(df_with_salary)/len(df)*100:.1f}%)")
+        salary_numeric, salary_by_edu = results['salary'].result()
+        df['salary_numeric'] = salary_numeric
         
-        # Calculate average salary by education level
-        salary_by_edu = df_with_salary.groupby('edlvlt')['salary_numeric'].mean().sort_values(ascending=False)
+        # Records with valid salary data
+        valid_count = salary_numeric.notna().sum()
+        print(f"   Records with valid salary data: {valid_count:,} ({valid_count/len(df)*100:.1f}%)")
         
-        for edu, salary in salary_by_edu.head(5).items():
-            print(f"   {edu}: ${salary:,.2f}")
+        print("\n".join(f"   {edu}: ${salary:,.2f}" for edu, salary in salary_by_edu.head(5).items()))
     except Exception as e:
         print(f"Error: {e}")
     
     print("\n3. WORKFORCE BY TIME PERIOD")
     print("-" * 40)
     try:
-        quarterly = df.groupby(['year', 'quarter'])['employment'].apply(
-            lambda x: sum(int(i) for i in x if i not in ['nan', '*****', ''])
-        )
-        for (year, quarter), count in quarterly.items():
-            print(f"   {year} {quarter}: {count:,} employees")
+        quarterly = results['quarterly'].result()
+        print("\n".join(f"   {year} {quarter}: {count:,} employees" for (year, quarter), count in quarterly.items()))
     except Exception as e:
         print(f"Error: {e}")
     
     print("\n4. LOCATION DISTRIBUTION (TOP 5 STATES)")
     print("-" * 40)
     try:
-        top_locations = df['loct'].value_counts().head(5)
-        for location, count in top_locations.items():
-            print(f"   {location}: {count:,} employees ({count/len(df)*100:.1f}%)")
+        top_locations = results['distributions'].result()['loct'].head(5)
+        print(format_distribution(top_locations, len(df)))
     except Exception as e:
         print(f"Error: {e}")
     
     print("\n5. JOB CATEGORIES (PATCO)")
     print("-" * 40)
     try:
-        patco_dist = df['patcot'].value_counts()
-        for category, count in patco_dist.items():
-            print(f"   {category}: {count:,} employees ({count/len(df)*100:.1f}%)")
+        patco_dist = results['distributions'].result()['patcot']
+        print(format_distribution(patco_dist, len(df)))
     except Exception as e:
         print(f"Error: {e}")
     
     print("\n6. AGE DISTRIBUTION")
     print("-" * 40)
     try:
-        age_dist = df['agelvlt'].value_counts().sort_index()
-        for age_group, count in age_dist.items():
-            print(f"   {age_group}: {count:,} employees ({count/len(df)*100:.1f}%)")
+        age_dist = results['distributions'].result()['agelvlt'].sort_index()
+        print(format_distribution(age_dist, len(df)))
     except Exception as e:
         print(f"Error: {e}")
     
     print("\n7. SUPERVISORY STATUS")
     print("-" * 40)
     try:
-        super_dist = df['supervist'].value_counts()
-        for status, count in super_dist.items():
-            print(f"   {status}: {count:,} employees ({count/len(df)*100:.1f}%)")
+        super_dist = results['distributions'].result()['supervist']
+        print(format_distribution(super_dist, len(df)))
     except Exception as e:
         print(f"Error: {e}")
     
     print("\n8. WORK SCHEDULE")
     print("-" * 40)
     try:
-        work_schedule = df['wrkscht'].value_counts()
-        for schedule, count in work_schedule.items():
-            print(f"   {schedule}: {count:,} employees ({count/len(df)*100:.1f}%)")
+        work_schedule = results['distributions'].result()['wrkscht']
+        print(format_distribution(work_schedule, len(df)))
     except Exception as e:
         print(f"Error: {e}")
     
@@ -222,13 +331,13 @@ def analyze_data(df, source_type):
     except Exception as e:
         print(f"Error: {e}")
 
-def analyze_redaction_patterns(df_sept, df_march):
-    """Analyze redaction patterns between September 2024 and March 2025"""
+def analyze_redaction_patterns(sept_file, march_file):
+    """Analyze redaction patterns between the September 2024 and March 2025 parquet files"""
     print(f"\n{'='*80}")
     print("REDACTION PATTERN ANALYSIS")
     print(f"{'='*80}\n")
     
-    if df_sept is None or df_march is None:
+    if not (os.path.exists(sept_file) and os.path.exists(march_file)):
         print("⚠️  Cannot perform redaction analysis - missing data files")
         return
     
@@ -237,11 +346,8 @@ def analyze_redaction_patterns(df_sept, df_march):
     print("\n" + "-"*60)
     
     # Calculate redaction by column for both datasets
-    sept_redaction = (df_sept == 'REDACTED').sum()
-    march_redaction = (df_march == 'REDACTED').sum()
-    
-    sept_total = len(df_sept)
-    march_total = len(df_march)
+    sept_redaction, sept_total = count_redacted_in_parquet(sept_file)
+    march_redaction, march_total = count_redacted_in_parquet(march_file)
     
     # Get all columns that have redaction in either dataset, sorted by March redaction
     all_redacted_cols = set(sept_redaction[sept_redaction > 0].index) | set(march_redaction[march_redaction > 0].index)
@@ -268,7 +374,7 @@ def analyze_redaction_patterns(df_sept, df_march):
 
 
 
-def run_duckdb_examples(filenames=None):
+def run_duckdb_examples(filenames=None, remote=False):
     """
     Download FedScope Parquet files, load them into DuckDB, 
     and run an agency head-count query broken out by year.
@@ -276,6 +382,9 @@ def run_duckdb_examples(filenames=None):
     Args:
         filenames (list): List of parquet filenames to download and analyze.
                          Defaults to September 2024 and 2023 files.
+        remote (bool): Query the files over HTTP with DuckDB's httpfs extension
+                       instead of downloading them first. Only the column chunks
+                       the query needs are fetched.
     """
     if filenames is None:
         filenames = [
@@ -300,36 +409,48 @@ def run_duckdb_examples(filenames=None):
         local_path = os.path.join(download_dir, filename)
         if not os.path.exists(local_path):
             print(f"Downloading: {filename}")
-            df_tmp = pd.read_parquet(base_url + filename)
-            df_tmp.to_parquet(local_path)
+            download_file(base_url + filename, local_path)
             print(f"✓ Saved → {local_path}")
         else:
             print(f"✓ Found cached file → {local_path}")
         return local_path
 
-    # Download all files
-    local_files = []
-    for filename in filenames:
-        local_path = fetch_parquet(filename)
-        local_files.append(local_path)
+    if remote:
+        # DuckDB reads these with HTTP range requests; nothing is cached locally
+        sources = [base_url + filename for filename in filenames]
+    else:
+        # Download all files concurrently (network-bound). Each file is fetched once,
+        # since two workers must not write the same .part file; the view still gets
+        # one source per requested filename, in the requested order
+        unique_filenames = list(dict.fromkeys(filenames))
+        with ThreadPoolExecutor(max_workers=min(8, len(unique_filenames))) as executor:
+            local_paths = dict(zip(unique_filenames, executor.map(fetch_parquet, unique_filenames)))
+        sources = [local_paths[filename] for filename in filenames]
 
     # ---------- 3. Create / connect to DuckDB and load files ----------
     db_path = os.path.join(download_dir, "fedscope.duckdb")
     con = duckdb.connect(db_path)
     print(f"\n✓ Connected to DuckDB database: {db_path}")
     
+    if remote:
+        con.execute("INSTALL httpfs; LOAD httpfs;")
+    
     # Create a unified view from all files
     con.execute("DROP VIEW IF EXISTS employment")
     
-    # Build UNION ALL query for all files
-    union_parts = []
-    for local_path in local_files:
-        union_parts.append(f"SELECT * FROM read_parquet('{local_path}')")
-    
-    union_query = " UNION ALL ".join(union_parts)
-    view_query = f"CREATE VIEW employment AS {union_query}"
+    # One read_parquet over the whole file list is a single scan that DuckDB can
+    # parallelize across every file's row groups (views can't take parameters,
+    # so the paths are quoted inline); union_by_name tolerates column drift.
+    # Employment is stored as a string, so the view parses it once, mirroring
+    # load_parquet, and queries can sum it directly (sentinels count as 0)
+    file_list = ", ".join("'" + source.replace("'", "''") + "'" for source in sources)
+    view_query = f"""
+        CREATE VIEW employment AS
+        SELECT * REPLACE (COALESCE(TRY_CAST(employment AS INTEGER), 0) AS employment)
+        FROM read_parquet([{file_list}], union_by_name=true)
+    """
     
-    print(f"Creating unified view from {len(local_files)} files...")
+    print(f"Creating unified view from {len(sources)} files...")
     con.execute(view_query)
     print("✓ Created unified employment view")
 
@@ -338,7 +459,7 @@ def run_duckdb_examples(filenames=None):
         SELECT
             year,
             agysubt AS agency_sub,
-            SUM(CAST(employment AS INTEGER)) AS employees
+            SUM(employment) AS employees
         FROM employment
         GROUP BY year, agency_sub
     """
@@ -370,16 +491,17 @@ def cleanup_download_folder():
         print(f"\nDownload folder contents:")
         print("-" * 40)
         
-        # Show folder contents and sizes
+        # Show folder contents and sizes (scandir entries reuse the directory
+        # read for the type check, so only files cost a stat)
         total_size = 0
-        for item in os.listdir(download_dir):
-            item_path = os.path.join(download_dir, item)
-            if os.path.isfile(item_path):
-                size = os.path.getsize(item_path)
-                total_size += size
-                print(f"  {item} ({size / 1024 / 1024:.1f} MB)")
-            else:
-                print(f"  {item} (directory)")
+        with os.scandir(download_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    size = entry.stat().st_size
+                    total_size += size
+                    print(f"  {entry.name} ({size / 1024 / 1024:.1f} MB)")
+                else:
+                    print(f"  {entry.name} (directory)")
         
         print(f"\nTotal size: {total_size / 1024 / 1024:.1f} MB")
         
@@ -416,7 +538,7 @@ def main():
     
     # Redaction analysis if both files available
     if df_local_sept is not None and df_local_march is not None:
-        analyze_redaction_patterns(df_local_sept, df_local_march)
+        analyze_redaction_patterns(LOCAL_SEPT_FILE, LOCAL_MARCH_FILE)
     
     # Then demonstrate download method
     df_download_sept, df_download_march = run_download_examples()
@@ -443,49 +565,51 @@ def main():
     print("- Documentation: https://abigailhaddad.github.io/fedscope_employment/")
     print("- Official FedScope: https://www.fedscope.opm.gov/")
 
+class Tee:
+    """File-like object that writes everything to several streams"""
+    def __init__(self, *streams):
+        self.streams = streams
+    
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+    
+    def flush(self):
+        for stream in self.streams:
+            stream.flush()
+
 def main_with_output_capture():
     """Run main function and capture output to file"""
     output_file = "examples_output.txt"
     
-    # Create a custom print function that writes to both console and file
-    original_print = print
+    # Send stdout to both the console and a buffer, so each print is formatted
+    # once (input() prompts go through sys.stdout too)
     original_input = input
     output_buffer = StringIO()
     
-    def dual_print(*args, **kwargs):
-        # Print to console
-        original_print(*args, **kwargs)
-        # Also print to buffer (but not file= kwargs)
-        if 'file' not in kwargs:
-            original_print(*args, **kwargs, file=output_buffer)
-    
     def input_with_logging(prompt=""):
-        # Print prompt to both console and buffer
-        dual_print(prompt, end="")
-        # Get actual input from user
-        response = original_input()
+        response = original_input(prompt)
         # Log the response to buffer
         output_buffer.write(response + "\n")
         return response
     
-    # Temporarily replace print and input functions
     import builtins
-    builtins.print = dual_print
     builtins.input = input_with_logging
     
     try:
-        # Run the main function
-        main()
+        with redirect_stdout(Tee(sys.stdout, output_buffer)):
+            # Run the main function
+            main()
         
         # Write buffer contents to file
         with open(output_file, 'w') as f:
             f.write(output_buffer.getvalue())
         
-        original_print(f"\n✓ Output saved to: {output_file}")
+        print(f"\n✓ Output saved to: {output_file}")
         
     finally:
-        # Restore original functions
-        builtins.print = original_print
+        # Restore original input
         builtins.input = original_input
         output_buffer.close()
 
@@ -8,15 +8,36 @@ Process March 2025 FedScope data
 """
 
 import pandas as pd
+import pyarrow.parquet as pq
 import zipfile
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from text_to_parquet import read_csv_as_text
 
 # Directories
 MARCH_DATA_DIR = "fedscope_data/march_2025_data"
 EXTRACT_DIR = "fedscope_data/march_2025_extracted"
 PARQUET_DIR = "fedscope_data/parquet"
+ROW_GROUP_SIZE = 256_000  # Rows per row group, matches text_to_parquet.py
+
+def member_directory(member):
+    """
+    Directory ZipFile.extract creates for a member, using the same path cleaning
+    (drive, absolute, '.' and '..' parts dropped) so it always stays inside EXTRACT_DIR
+    """
+    arcname = os.path.splitdrive(member.replace('/', os.sep))[1]
+    parts = [p for p in arcname.split(os.sep) if p not in ('', os.curdir, os.pardir)]
+    # Directory entries are created themselves; files need their parent
+    if not member.endswith('/'):
+        parts = parts[:-1]
+    return os.path.join(EXTRACT_DIR, *parts)
+
+def extract_member(zip_file, member):
+    """Extract one member using its own ZipFile handle (handles aren't thread-safe)"""
+    with zipfile.ZipFile(zip_file, 'r') as zf:
+        zf.extract(member, EXTRACT_DIR)
 
 def extract_files():
     """Extract all ZIP files to a temporary directory"""
@@ -34,7 +55,16 @@ def extract_files():
     for zip_file in zip_files:
         print(f"   Extracting {zip_file.name}...")
         with zipfile.ZipFile(zip_file, 'r') as zf:
-            zf.extractall(EXTRACT_DIR)
+            members = zf.namelist()
+        
+        # Create directories up front: ZipFile.extract calls makedirs without
+        # exist_ok, so workers sharing a directory would race on it
+        for directory in {member_directory(m) for m in members}:
+            os.makedirs(directory, exist_ok=True)
+        
+        # zlib releases the GIL, so members decompress in parallel
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(lambda member: extract_member(zip_file, member), members))
     
     # List extracted files
     txt_files = list(Path(EXTRACT_DIR).glob("March_2025_Employment_*.txt"))
@@ -52,8 +82,9 @@ def load_and_combine_files(txt_files):
     for i, txt_file in enumerate(txt_files, 1):
         print(f"\n   Loading {txt_file.name}...")
         
-        # Read with pipe delimiter and handle quotes
-        df = pd.read_csv(txt_file, sep='|', quotechar='"', dtype=str)
+        # Read with pipe delimiter and handle quotes (pyarrow's multithreaded
+        # parser, all columns as text like the FACTDATA reads in text_to_parquet.py)
+        df = read_csv_as_text(txt_file, delimiter='|')
         
         rows = len(df)
         total_rows += rows
@@ -87,9 +118,9 @@ def standardize_columns(df):
     """Transform columns to match historical format exactly"""
     print("\n3. Standardizing columns to match historical format...")
     
-    # Load September 2024 to get exact column structure
-    sept_2024 = pd.read_parquet('fedscope_data/parquet/fedscope_employment_September_2024.parquet')
-    target_columns = list(sept_2024.columns)
+    # Read only the September 2024 footer to get exact column structure (no row data)
+    sept_2024_schema = pq.read_schema('fedscope_data/parquet/fedscope_employment_September_2024.parquet')
+    target_columns = [name for name in sept_2024_schema.names if not name.startswith('__index_level_')]
     print(f"   Target format has {len(target_columns)} columns")
     
     # Create new dataframe with historical structure
@@ -171,7 +202,8 @@ def validate_data(df):
     
     # Check agencies
     if 'agyt' in df.columns:
-        top_agencies = df['agyt'].value_counts().head(10)
+        # nlargest picks the top 10 without sorting every agency's count
+        top_agencies = df['agyt'].value_counts(sort=False).nlargest(10)
         print("\n   Top 10 agencies by employee count:")
         for agency, count in top_agencies.items():
             if agency != 'REDACTED':
@@ -179,7 +211,8 @@ def validate_data(df):
     
     # Check salary data
     if 'salary' in df.columns:
-        non_redacted_salaries = df[df['salary'] != 'REDACTED']['salary'].astype(float)
+        # Coerce in one vectorized pass; REDACTED and blanks become NaN and are dropped
+        non_redacted_salaries = pd.to_numeric(df['salary'], errors='coerce').dropna()
         if len(non_redacted_salaries) > 0:
             print(f"\n   Salary statistics (non-redacted):")
             print(f"      Mean: ${non_redacted_salaries.mean():,.0f}")
@@ -201,18 +234,18 @@ def save_parquet(df):
     # Create parquet directory if needed
     os.makedirs(PARQUET_DIR, exist_ok=True)
     
-    # Save file
+    # Save file (zstd and row group size same as the historical files written by text_to_parquet.py)
     output_file = os.path.join(PARQUET_DIR, "fedscope_employment_March_2025.parquet")
-    df.to_parquet(output_file, index=False)
+    df.to_parquet(output_file, compression='zstd', index=False, row_group_size=ROW_GROUP_SIZE)
     
     # Check file size
     file_size = os.path.getsize(output_file) / (1024 * 1024)  # MB
     print(f"   Saved to: {output_file}")
     print(f"   File size: {file_size:.1f} MB")
     
-    # Verify it can be read back
-    test_df = pd.read_parquet(output_file)
-    print(f"   Verified: Successfully read back {len(test_df):,} rows")
+    # Verify it can be read back; only the row count is needed, which the footer has
+    num_rows = pq.read_metadata(output_file).num_rows
+    print(f"   Verified: Successfully read back {num_rows:,} rows")
 
 def main():
     """Main processing pipeline"""
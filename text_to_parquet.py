@@ -4,9 +4,11 @@ Convert TXT files to Parquet using exact same logic as load_to_duckdb_robust.py
 """
 
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import os
 import re
-import glob
 from pathlib import Path
 import logging
 
@@ -15,6 +17,39 @@ logger = logging.getLogger(__name__)
 
 EXTRACTED_DIR = "fedscope_data/extracted"
 PARQUET_DIR = "fedscope_data/parquet"
+# Rows per parquet row group: ~2M-row quarters split into several groups so
+# DuckDB/Arrow can scan them in parallel instead of one large group
+ROW_GROUP_SIZE = 256_000
+# pd.read_csv's default missing-value strings, so the Arrow CSV reader treats them the same
+PANDAS_NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+                    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+                    'n/a', 'nan', 'null']
+
+def read_csv_as_text(path, delimiter=',', encoding='utf8'):
+    """
+    Read a delimited file with pyarrow's multithreaded CSV parser, every column as text.
+    
+    Gives the same frame as pd.read_csv(dtype=str): codes like '0610' or '01' keep
+    their leading zeros and missing values are NaN. pd.read_csv(engine='pyarrow')
+    can't be used for this, since Arrow guesses numeric types before dtype=str applies.
+    """
+    read_options = pacsv.ReadOptions(encoding=encoding)
+    parse_options = pacsv.ParseOptions(delimiter=delimiter)
+    
+    # Column names from the header, to pin every column to string
+    with pacsv.open_csv(path, read_options=read_options, parse_options=parse_options) as reader:
+        column_names = reader.schema.names
+    convert_options = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in column_names},
+        null_values=PANDAS_NA_VALUES,
+        strings_can_be_null=True
+    )
+    table = pacsv.read_csv(path, read_options=read_options, parse_options=parse_options,
+                           convert_options=convert_options)
+    
+    df = table.to_pandas()
+    # Arrow nulls come back as None; pd.read_csv(dtype=str) uses NaN
+    return df.where(df.notna(), np.nan)
 
 def get_quarter_year_from_filename(filename):
     """Extract month and year from FedScope filename patterns."""
@@ -38,6 +73,24 @@ def get_quarter_year_from_filename(filename):
     
     return None, None
 
+def find_factdata_file(directory):
+    """Depth-first os.scandir search for the first FACTDATA*.TXT file (files before subdirectories)."""
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name.upper()
+            if entry.is_file() and name.startswith('FACTDATA') and name.endswith('.TXT'):
+                return entry.path
+            if entry.is_dir():
+                subdirs.append(entry.path)
+    
+    for subdir in subdirs:
+        fact_file = find_factdata_file(subdir)
+        if fact_file:
+            return fact_file
+    
+    return None
+
 def load_lookup_tables(data_dir, dataset_key):
     """Load lookup tables for a dataset - copied from load_to_duckdb_robust.py"""
     logger.info(f"  Loading lookup tables for {dataset_key}...")
@@ -258,7 +311,8 @@ def create_denormalized_records(fact_df, lookups, dataset_key):
     # LEFT JOIN location
     if 'location' in lookups and 'loc' in result.columns:
         # Normalize location codes - pad with leading zeros to match lookup table format
-        result['loc'] = result['loc'].astype(str).str.strip().str.zfill(2)
+        # (already cast and stripped with the other string columns above)
+        result['loc'] = result['loc'].str.zfill(2)
         
         # Also normalize lookup table location codes
         loc_lookup = lookups['location'].copy()
@@ -293,29 +347,17 @@ def process_single_dataset(dataset_dir):
         
         logger.info(f"Processing {dataset_key}...")
         
-        # Find the data directory containing files
-        data_dirs = []
-        for root, dirs, files in os.walk(dataset_path):
-            if any(f.upper().startswith('FACTDATA') for f in files):
-                data_dirs.append(root)
-        
-        if not data_dirs:
+        # Find the fact file; the lookup tables live in the same directory
+        fact_file = find_factdata_file(dataset_path)
+        if not fact_file:
             logger.warning(f"  No FACTDATA files found in {dataset_path}")
             return None
         
-        data_dir = data_dirs[0]
-        
-        # Find fact file
-        fact_files = glob.glob(os.path.join(data_dir, "FACTDATA*.TXT"))
-        if not fact_files:
-            logger.warning(f"  No fact data files found")
-            return None
-        
-        fact_file = fact_files[0]
+        data_dir = os.path.dirname(fact_file)
         
-        # Load fact data
+        # Load fact data (pyarrow's multithreaded CSV parser, all columns as text)
         logger.info(f"  Loading fact data from {os.path.basename(fact_file)}...")
-        fact_df = pd.read_csv(fact_file, sep=',', encoding='latin-1', dtype=str)
+        fact_df = read_csv_as_text(fact_file, delimiter=',', encoding='latin-1')
         
         # Clean column names
         fact_df.columns = [col.strip().replace(' ', '_').replace('-', '_').lower() for col in fact_df.columns]
@@ -340,7 +382,8 @@ def process_single_dataset(dataset_dir):
         
         # Write to Parquet with compression
         logger.info(f"  Writing to {output_filename}...")
-        denormalized_df.to_parquet(output_path, compression='zstd', index=False)
+        denormalized_df.to_parquet(output_path, compression='zstd', index=False,
+                                   row_group_size=ROW_GROUP_SIZE)
         
         # Get file size
         size_mb = os.path.getsize(output_path) / (1024 * 1024)
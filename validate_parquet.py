@@ -8,6 +8,7 @@ import os
 import glob
 from pathlib import Path
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -15,6 +16,27 @@ logger = logging.getLogger(__name__)
 PARQUET_DIR = "fedscope_data/parquet"
 EXTRACTED_DIR = "fedscope_data/extracted"
 
+# Description columns filled in from the lookup tables
+LOOKUP_FIELDS = [
+    'agelvlt', 'agysubt', 'edlvlt', 'loslvlt', 'loct', 'occfamt', 'occt', 
+    'occtypt', 'patcot', 'payplant', 'ppgrdt', 'ppgroupt', 'sallvlt', 
+    'stemocct', 'supervist', 'toat', 'wkstatt', 'wrkscht', 'wstypt'
+]
+
+def read_parquet_file(path):
+    """Read one parquet file into a DataFrame."""
+    return pd.read_parquet(path, engine='pyarrow', pre_buffer=True, use_threads=True)
+
+def prefetch_parquet_files(parquet_files):
+    """Yield (path, future DataFrame), reading the next file while the current one is validated."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        upcoming = executor.submit(read_parquet_file, parquet_files[0])
+        for index, path in enumerate(parquet_files):
+            current = upcoming
+            if index + 1 < len(parquet_files):
+                upcoming = executor.submit(read_parquet_file, parquet_files[index + 1])
+            yield path, current
+
 def validate_all_parquet_files():
     """Validate all parquet files."""
     
@@ -36,18 +58,21 @@ def validate_all_parquet_files():
     failed_validations = []
     validation_summary = []
     
-    for i, pf in enumerate(parquet_files, 1):
+    for i, (pf, pending_read) in enumerate(prefetch_parquet_files(parquet_files), 1):
         filename = os.path.basename(pf)
         logger.info(f"\n[{i}/{len(parquet_files)}] Validating {filename}...")
         
         try:
-            # Read parquet file
-            df = pd.read_parquet(pf)
+            # Read parquet file (already started in the background)
+            df = pending_read.result()
             record_count = len(df)
             total_records += record_count
             
+            # Count nulls in every lookup field in one pass, shared by both checks
+            null_counts = count_lookup_nulls(df)
+            
             # Basic validation
-            validation_result = validate_single_file(df, filename)
+            validation_result = validate_single_file(df, filename, null_counts)
             validation_summary.append(validation_result)
             
             if not validation_result['valid']:
@@ -64,23 +89,16 @@ def validate_all_parquet_files():
             
             # Check for null descriptions (merge failures) - all lookup tables
             null_checks = []
-            lookup_fields = [
-                'agelvlt', 'agysubt', 'edlvlt', 'loslvlt', 'loct', 'occfamt', 'occt', 
-                'occtypt', 'patcot', 'payplant', 'ppgrdt', 'ppgroupt', 'sallvlt', 
-                'stemocct', 'supervist', 'toat', 'wkstatt', 'wrkscht', 'wstypt'
-            ]
-            for field in lookup_fields:
-                if field in df.columns:
-                    null_count = df[field].isnull().sum()
-                    null_pct = (null_count / record_count) * 100
-                    null_checks.append((field, null_count, null_pct))
-                    
-                    if null_pct > 10:  # More than 10% null
-                        logger.warning(f"  ⚠️  {field}: {null_count:,} null ({null_pct:.1f}%)")
-                    elif null_pct > 0:
-                        logger.info(f"  ⚠️  {field}: {null_count:,} null ({null_pct:.1f}%)")
-                    else:
-                        logger.info(f"  ✅ {field}: complete merge")
+            for field, null_count in null_counts.items():
+                null_pct = (null_count / record_count) * 100
+                null_checks.append((field, null_count, null_pct))
+                
+                if null_pct > 10:  # More than 10% null
+                    logger.warning(f"  ⚠️  {field}: {null_count:,} null ({null_pct:.1f}%)")
+                elif null_pct > 0:
+                    logger.info(f"  ⚠️  {field}: {null_count:,} null ({null_pct:.1f}%)")
+                else:
+                    logger.info(f"  ✅ {field}: complete merge")
             
             validation_result['null_checks'] = null_checks
             
@@ -136,7 +154,12 @@ def validate_all_parquet_files():
     
     return len(failed_validations) == 0
 
-def validate_single_file(df, filename):
+def count_lookup_nulls(df):
+    """Count nulls in each lookup description field present in df."""
+    present_fields = [f for f in LOOKUP_FIELDS if f in df.columns]
+    return df[present_fields].isnull().sum()
+
+def validate_single_file(df, filename, null_counts=None):
     """Validate a single parquet file."""
     result = {
         'filename': filename,
@@ -158,17 +181,12 @@ def validate_single_file(df, filename):
             result['issues'].append(f"Found {len(non_one_employment)} records with employment != 1")
     
     # Check for completely empty description fields - all lookup tables
-    lookup_fields = [
-        'agelvlt', 'agysubt', 'edlvlt', 'loslvlt', 'loct', 'occfamt', 'occt', 
-        'occtypt', 'patcot', 'payplant', 'ppgrdt', 'ppgroupt', 'sallvlt', 
-        'stemocct', 'supervist', 'toat', 'wkstatt', 'wrkscht', 'wstypt'
-    ]
-    for field in lookup_fields:
-        if field in df.columns:
-            null_count = df[field].isnull().sum()
-            if null_count == len(df):
-                result['valid'] = False
-                result['issues'].append(f"All {field} values are null - complete merge failure")
+    if null_counts is None:
+        null_counts = count_lookup_nulls(df)
+    for field, null_count in null_counts.items():
+        if null_count == len(df):
+            result['valid'] = False
+            result['issues'].append(f"All {field} values are null - complete merge failure")
     
     return result
 